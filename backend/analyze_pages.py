@@ -1,12 +1,12 @@
 # backend/analyze_pages.py
 import pandas as pd
+import numpy as np
 import datetime
-import matplotlib.pyplot as plt
-import seaborn as sns
+import functools
+import io
 from contextlib import redirect_stdout
-import matplotlib
-import networkx as nx
 import os
+import sys
 import ast  # To parse string representation of lists
 from backend.text_style import PrintStyle, TextHelper
 from backend.globals import (
@@ -24,17 +24,82 @@ from backend.globals import (
     NOTION_PROPERTY_DUE,
 )
 
-# Visualization settings
-matplotlib.rcParams["axes.unicode_minus"] = False
-matplotlib.rcParams["font.family"] = "DejaVu Sans"
+# Only these CSV columns are used by the analysis; the rest (Body Content,
+# Comments, UIDs, ...) are skipped at read time to keep the frame small.
+ANALYSIS_COLUMNS = {
+    "NID",
+    "Name",
+    "Status",
+    "Priority",
+    "Due",
+    "Created",
+    "Completed",
+    "Started",
+    "Children NIDs",
+    "Active Tags",
+    NOTION_PROPERTY_STATUS,
+    NOTION_PROPERTY_PRIORITY,
+    NOTION_PROPERTY_DUE,
+}
+# Rows parsed per read_csv chunk when loading the pages CSV
+CSV_CHUNK_SIZE = 200_000
+# Longest table printed per section of the text report
+MAX_TABLE_ROWS = 50
+# A Monday (1970-01-05) that anchors the weekly velocity buckets
+WEEK_EPOCH_MONDAY = np.datetime64("1970-01-05", "D")
+
+
+@functools.lru_cache(maxsize=None)
+def load_plotting():
+    """
+    Imports and configures matplotlib/seaborn on first use, so text-only runs
+    (make_charts=False) never pay for the plotting stack.
+    """
+    import matplotlib
+
+    # Charts are only ever saved to PNG, so use the non-interactive Agg backend
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Visualization settings
+    matplotlib.rcParams["axes.unicode_minus"] = False
+    matplotlib.rcParams["font.family"] = "DejaVu Sans"
+    sns.set_theme(style="whitegrid")
+    return plt, sns
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    """
+    Parses date strings to naive UTC timestamps.
+    Notion exports ISO 8601, which has a fast vectorized parser; only the values
+    it could not read are retried with the slower per-value "mixed" parser.
+    """
+    parsed = pd.to_datetime(values, errors="coerce", format="ISO8601", utc=True)
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(
+            values[retry], errors="coerce", format="mixed", utc=True
+        )
+    return parsed.dt.tz_localize(None)
 
 
 def file_header(text):
     return f"\n{'-'*40}\n{text}\n{'-'*40}\n"
 
 
-def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE_PATH):
-    tasks_df = pd.read_csv(csv_file)
+def analyze_tasks(
+    csv_file=PAGES_CSV_FILE_PATH,
+    output_file=ANALYSIS_OUTPUT_FILE_PATH,
+    make_charts=True,
+):
+    # Read in chunks so the parser's working buffers stay bounded on large exports
+    chunks = pd.read_csv(
+        csv_file,
+        usecols=lambda c: c.strip() in ANALYSIS_COLUMNS,
+        chunksize=CSV_CHUNK_SIZE,
+    )
+    tasks_df = pd.concat(chunks, ignore_index=True)
     if tasks_df.empty:
         PrintStyle.print_warning("The database is empty. No analysis to perform.")
         return
@@ -44,22 +109,6 @@ def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE
     # Print columns to verify what Pandas actually sees (Remove this later if you want)
     PrintStyle.print_info(f"Loaded CSV Columns: {list(tasks_df.columns)}")
 
-    status_ok = (
-        tasks_df[NOTION_PROPERTY_STATUS].notna().any()
-        if NOTION_PROPERTY_STATUS in tasks_df.columns
-        else False
-    )
-    priority_ok = (
-        tasks_df[NOTION_PROPERTY_PRIORITY].notna().any()
-        if NOTION_PROPERTY_PRIORITY in tasks_df.columns
-        else False
-    )
-    due_ok = (
-        tasks_df[NOTION_PROPERTY_DUE].notna().any()
-        if NOTION_PROPERTY_DUE in tasks_df.columns
-        else False
-    )
-
     # Ensure critical columns exist even if the CSV didn't have them
     expected_columns = [
         "Status",
@@ -94,15 +143,18 @@ def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE
     # Apply Tag Filtering
     if FILTER_TAGS:
         # Check if any of the FILTER_TAGS exist in 'Active Tags'
-        def match_tags(row):
-            # Simplify: Only check the Active Tags column
-            active = parse_list_col(row["Active Tags"])
-            if active:
-                return not set(active).isdisjoint(FILTER_TAGS)
-            return False
+        filter_set = frozenset(FILTER_TAGS)
+        active_tags = tasks_df["Active Tags"]
+        # Many rows share the same tag list, so parse each distinct string once
+        # and filter with a vectorized isin instead of a per-row apply
+        matching = [
+            tags
+            for tags in active_tags.dropna().unique()
+            if not filter_set.isdisjoint(parse_list_col(tags))
+        ]
 
         original_count = len(tasks_df)
-        tasks_df = tasks_df[tasks_df.apply(match_tags, axis=1)].copy()
+        tasks_df = tasks_df[active_tags.isin(matching)].copy()
         PrintStyle.print_info(
             f"Filtered tasks by tags {FILTER_TAGS}: {len(tasks_df)}/{original_count} remain."
         )
@@ -113,9 +165,9 @@ def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE
     )
     PrintStyle.print_subheader("ANALYZING DATA AVAILABILITY")
 
-    status_ok = tasks_df["Status"].notna().any()
-    priority_ok = tasks_df["Priority"].notna().any()
-    due_ok = tasks_df["Due"].notna().any()
+    # One notna/any reduction over the three columns instead of one per column
+    available = tasks_df[["Status", "Priority", "Due"]].notna().any()
+    status_ok, priority_ok, due_ok = available
 
     if not status_ok:
         PrintStyle.print_warning(
@@ -138,17 +190,16 @@ def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE
     # Default to lowest priority:
     tasks_df["Priority"] = tasks_df["Priority"].fillna("Note")
     tasks_df["Name"] = tasks_df["Name"].fillna("Untitled")
+    # Truncate names once for all the text tables instead of per display
+    tasks_df["Name_Display"] = TextHelper.truncate_series(tasks_df["Name"])
 
     PrintStyle.print_divider()
     # --- PRE-PROCESSING ---
     # Convert dates with robust parsing using utc=True to handle mixed timezones
-    tasks_df["Due Date"] = pd.to_datetime(
-        tasks_df["Due"], errors="coerce", format="mixed", utc=True
-    ).dt.tz_localize(None)
-
-    tasks_df["Created Date"] = pd.to_datetime(
-        tasks_df["Created"], errors="coerce", format="mixed", utc=True
-    ).dt.tz_localize(None)
+    tasks_df["Due Date"] = parse_dates(tasks_df["Due"])
+    tasks_df["Created Date"] = parse_dates(tasks_df["Created"])
+    # Parsed once here so the chart code doesn't have to re-parse it
+    tasks_df["Completed Date"] = parse_dates(tasks_df["Completed"])
 
     # Normalize Status
     status_mapping = {
@@ -160,14 +211,13 @@ def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE
         "Doing": "doing",
         "Done": "done",
     }
-    if NOTION_PROPERTY_STATUS in tasks_df.columns:
-        tasks_df[NOTION_PROPERTY_STATUS] = tasks_df[NOTION_PROPERTY_STATUS].replace(
-            status_mapping
-        )
-    if NOTION_PROPERTY_STATUS in tasks_df.columns:
-        tasks_df[NOTION_PROPERTY_STATUS] = tasks_df[NOTION_PROPERTY_STATUS].replace(
-            status_mapping
-        )
+    # Mapping a categorical only rewrites its (few) categories, not every row
+    status = tasks_df[NOTION_PROPERTY_STATUS].astype("category")
+    tasks_df[NOTION_PROPERTY_STATUS] = status.map(lambda x: status_mapping.get(x, x))
+
+    # Lowercase status once; every analyzer filters on this instead of re-lowering.
+    # Stored as a category so isin/value_counts compare small integer codes.
+    tasks_df["Status_Norm"] = status.map(lambda x: str(x).lower()).astype("category")
 
     # Normalize Priority for sorting
     priority_map = {
@@ -177,47 +227,59 @@ def analyze_tasks(csv_file=PAGES_CSV_FILE_PATH, output_file=ANALYSIS_OUTPUT_FILE
         "Low (>month)": 3,
         "Note": 4,
     }
-    tasks_df["Priority_Score"] = tasks_df["Priority"].map(priority_map).fillna(5)
+    priority = tasks_df["Priority"].astype("category")
+    tasks_df["Priority"] = priority
+    # Score each category once, then look rows up by their category code.
+    # Scores are 0-5, so an int8 column is enough for every sort and comparison
+    score_lut = priority.cat.categories.map(lambda p: priority_map.get(p, 5))
+    tasks_df["Priority_Score"] = score_lut.to_numpy(dtype="int8")[priority.cat.codes]
 
     # Identify "Container/Project" tasks vs "Actionable" tasks
-    def has_children(x):
-        try:
-            val = ast.literal_eval(x) if isinstance(x, str) else x
-            return isinstance(val, list) and len(val) > 0
-        except:
-            return False
+    tasks_df["Is_Project"] = TextHelper.has_list_items(tasks_df["Children NIDs"])
 
-    tasks_df["Is_Project"] = tasks_df["Children NIDs"].apply(has_children)
+    # Open (To Do / Doing) and actionable (open, not a project) flags shared by
+    # every analyzer, so the status lookup and the combined mask are built once
+    tasks_df["Is_Open"] = tasks_df["Status_Norm"].isin(["to do", "doing"])
+    tasks_df["Is_Actionable"] = tasks_df["Is_Open"] & ~tasks_df["Is_Project"]
+
+    # A single reference time for every date comparison in this run
+    today = pd.Timestamp.now().tz_localize(None)
 
     # Create output directory
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
 
+    # Collect the report in memory and write it out once, instead of a file
+    # write per print() call
+    report = io.StringIO()
+    with redirect_stdout(report):
+        # 1. Weekly Workflow
+        print(f"\n{'='*80}\n🚀 THIS WEEK'S WORKFLOW\n{'='*80}\n")
+        analyze_weekly_focus(tasks_df, today)
+
+        # 2. Project Status
+        print(f"\n{'='*80}\n📂 Active Projects (Containers)\n{'='*80}\n")
+        analyze_active_projects(tasks_df)
+
+        # 3. Standard Analysis
+        print(f"\n{'='*80}\n📊 Task Statistics\n{'='*80}\n")
+        analyze_task_summary(tasks_df)
+
+        print(f"\n{'='*80}\n📋 Backlog Analysis\n{'='*80}\n")
+        analyze_task_dates(tasks_df, today)  # Overdue
+        analyze_task_priorities(tasks_df)  # Priority breakdown
+        analyze_upcoming_tasks(tasks_df)  # General upcoming
+
+        # 4. Uncategorized (The "Worst Case" Handler)
+        # This ensures that even if columns are missing, you see what was fetched while respecting the toggle
+        if INCLUDE_UNCATEGORIZED:
+            print(f"\n{'='*80}\n⚠️ Unclassified / Other Tasks\n{'='*80}\n")
+            analyze_uncategorized(tasks_df)
+
     with open(output_file, "w", encoding="utf-8") as f:
-        with redirect_stdout(f):
-            # 1. Weekly Workflow
-            print(f"\n{'='*80}\n🚀 THIS WEEK'S WORKFLOW\n{'='*80}\n")
-            analyze_weekly_focus(tasks_df)
-
-            # 2. Project Status
-            print(f"\n{'='*80}\n📂 Active Projects (Containers)\n{'='*80}\n")
-            analyze_active_projects(tasks_df)
-
-            # 3. Standard Analysis
-            print(f"\n{'='*80}\n📊 Task Statistics\n{'='*80}\n")
-            analyze_task_summary(tasks_df)
-
-            print(f"\n{'='*80}\n📋 Backlog Analysis\n{'='*80}\n")
-            analyze_task_dates(tasks_df)  # Overdue
-            analyze_task_priorities(tasks_df)  # Priority breakdown
-            analyze_upcoming_tasks(tasks_df)  # General upcoming
-
-            # 4. Uncategorized (The "Worst Case" Handler)
-            # This ensures that even if columns are missing, you see what was fetched while respecting the toggle
-            if INCLUDE_UNCATEGORIZED:
-                print(f"\n{'='*80}\n⚠️ Unclassified / Other Tasks\n{'='*80}\n")
-                analyze_uncategorized(tasks_df)
-
-    generate_charts(tasks_df)
+        f.write(report.getvalue())
+
+    if make_charts:
+        generate_charts(tasks_df)
     PrintStyle.print_saved("Text report", output_file)
 
 
@@ -238,9 +300,7 @@ def analyze_uncategorized(df: pd.DataFrame):
     ]
 
     # Check if 'Status' column even has meaningful data or if it's all "unknown"
-    uncategorized = df[
-        ~df[NOTION_PROPERTY_STATUS].str.lower().isin(known_statuses)
-    ].copy()
+    uncategorized = df[~df["Status_Norm"].isin(known_statuses)]
 
     if not uncategorized.empty:
         print("These items have a Status that is not recognized (or missing):")
@@ -248,58 +308,73 @@ def analyze_uncategorized(df: pd.DataFrame):
         cols = ["NID", "Name", NOTION_PROPERTY_STATUS, "Created"]
 
         # Format for display
-        display = uncategorized[cols].copy()
-        # This prevents "0" from showing as "0.0" if pandas reverts type during slicing
-        display["NID"] = display["NID"].astype(int).astype(str)
-        display["Name"] = display["Name"].apply(TextHelper.truncate_text)
-        display["Created"] = display["Created"].apply(
-            lambda x: str(x).split(" ")[0]
-        )  # Show only date
+        shown = uncategorized.head(MAX_TABLE_ROWS)
+        display = shown[cols].assign(
+            # NID is already an int column (cast once at load), so "0" never shows as "0.0"
+            NID=shown["NID"].astype(str),
+            Name=shown["Name_Display"],
+            # Show only date
+            Created=shown["Created"]
+            .astype("string")
+            .str.split(" ", n=1)
+            .str[0]
+            .fillna("None"),
+        )
 
         print(display.to_string(index=False))
+        if len(uncategorized) > MAX_TABLE_ROWS:
+            print(
+                f"... and {len(uncategorized) - MAX_TABLE_ROWS} more tasks not shown."
+            )
         print(f"\nTotal Unclassified Items: {len(uncategorized)}")
     else:
         print("All items are properly classified into standard statuses.")
 
 
-def print_task_table(df):
-    """Helper to print a clean table with Due Dates."""
+def print_task_table(df, max_rows=MAX_TABLE_ROWS):
+    """Helper to print a clean table with Due Dates (at most `max_rows` rows)."""
     if df.empty:
         print("No tasks found.")
         return
 
-    display_df = df.copy()
-    # Explicitly format NID for the print view
-    display_df["NID"] = display_df["NID"].astype(int).astype(str)
-    display_df["Name"] = display_df["Name"].apply(TextHelper.truncate_text)
-    display_df["Due"] = display_df["Due"].fillna("None")
-
+    # Only format the rows that are printed; to_string is slow on large frames
+    shown = df.head(max_rows)
+    # Build the view from just the printed columns instead of copying the whole frame
     cols = ["NID", "Name", NOTION_PROPERTY_STATUS, "Priority", "Due"]
-    print(display_df[cols].to_string(index=False))
+    display_df = shown[cols].assign(
+        # Explicitly format NID for the print view (already int since load)
+        NID=shown["NID"].astype(str),
+        Name=shown["Name_Display"],
+        Due=shown["Due"].fillna("None"),
+    )
+    print(display_df.to_string(index=False))
+    if len(df) > max_rows:
+        print(f"... and {len(df) - max_rows} more tasks not shown.")
 
 
-def analyze_weekly_focus(df: pd.DataFrame):
+def analyze_weekly_focus(df: pd.DataFrame, today: pd.Timestamp):
     """
     Generates a strict, prioritized list of what to work on.
     Filters out 'Project' containers to avoid clutter.
     """
-    today = pd.Timestamp.now().tz_localize(None)
     next_week = today + datetime.timedelta(days=7)
 
     # Base filter: Active items (To Do or Doing) AND NOT Projects
-    active_items = df[
-        (df[NOTION_PROPERTY_STATUS].str.lower().isin(["to do", "doing"]))
-        & (df["Is_Project"] == False)
-    ].copy()
+    active_items = df[df["Is_Actionable"]]
+
+    # Bucket every active item once with boolean masks, instead of re-deriving
+    # each section from the previous ones with NID set lookups
+    due = active_items["Due Date"]
+    is_immediate = due.notna() & (
+        (due < today) | (active_items["Status_Norm"] == "doing")
+    )
+    is_due_week = (due >= today) & (due <= next_week) & ~is_immediate
+    is_backlog = ~(is_immediate | is_due_week)
 
     # --- 1. IMMEDIATE ACTION ---
-    immediate = active_items[
-        (active_items["Due Date"].notna())
-        & (
-            (active_items["Due Date"] < today)
-            | (active_items[NOTION_PROPERTY_STATUS].str.lower() == "doing")
-        )
-    ].sort_values(by=["Priority_Score", "Due Date"])
+    immediate = active_items[is_immediate].sort_values(
+        by=["Priority_Score", "Due Date"]
+    )
 
     print(file_header("1. IMMEDIATE ACTION (Overdue & Dated Active)"))
     if not immediate.empty:
@@ -308,11 +383,7 @@ def analyze_weekly_focus(df: pd.DataFrame):
         print("No immediate overdue or dated active tasks.")
 
     # --- 2. DUE THIS WEEK ---
-    due_week = active_items[
-        (active_items["Due Date"] >= today)
-        & (active_items["Due Date"] <= next_week)
-        & (~active_items["NID"].isin(immediate["NID"]))
-    ].sort_values(by=["Due Date", "Priority_Score"])
+    due_week = active_items[is_due_week].sort_values(by=["Due Date", "Priority_Score"])
 
     print(file_header(f"2. DUE BY NEXT WEEK (By {next_week.strftime('%Y-%m-%d')})"))
     if not due_week.empty:
@@ -321,32 +392,30 @@ def analyze_weekly_focus(df: pd.DataFrame):
         print("No additional tasks due by next week.")
 
     # --- 3. BACKLOG (Undated or Far Future) ---
-    candidates_backlog = active_items[
-        (~active_items["NID"].isin(immediate["NID"]))
-        & (~active_items["NID"].isin(due_week["NID"]))
-    ]
+    candidates_backlog = active_items[is_backlog]
 
     dated_backlog = candidates_backlog[candidates_backlog["Due Date"].notna()]
     undated_backlog = candidates_backlog[candidates_backlog["Due Date"].isna()]
 
+    # Only the first 15 are shown, so select them with nsmallest instead of a full sort
     if not dated_backlog.empty:
-        backlog = dated_backlog.sort_values(by=["Due Date", "Priority_Score"])
+        backlog = dated_backlog.nsmallest(15, ["Due Date", "Priority_Score"])
     else:
-        backlog = undated_backlog.sort_values(by=["Priority_Score", "Created Date"])
+        backlog = undated_backlog.nsmallest(15, ["Priority_Score", "Created Date"])
 
     print(file_header("3. HIGH PRIORITY BACKLOG (Undated Active & Future)"))
     if not backlog.empty:
-        print_task_table(backlog.head(15))
+        print_task_table(backlog)
     else:
         print("No backlog items.")
 
 
 def analyze_active_projects(df: pd.DataFrame):
     """Shows status of 'Container' tasks (like PhD Thesis)."""
-    projects = df[
-        (df["Is_Project"] == True)
-        & (df[NOTION_PROPERTY_STATUS].str.lower().isin(["to do", "doing"]))
-    ].sort_values(by="Priority_Score")
+    # Stable sort so equally ranked projects keep their fetched order
+    projects = df[df["Is_Project"] & df["Is_Open"]].sort_values(
+        by="Priority_Score", kind="stable"
+    )
 
     if not projects.empty:
         print("These are large containers/projects currently active:")
@@ -357,21 +426,12 @@ def analyze_active_projects(df: pd.DataFrame):
 
 def analyze_task_summary(tasks_df: pd.DataFrame):
     total_tasks = len(tasks_df)
-    completed = len(
-        tasks_df[
-            tasks_df[NOTION_PROPERTY_STATUS].str.contains("done", case=False, na=False)
-        ]
-    )
-    doing = len(
-        tasks_df[
-            tasks_df[NOTION_PROPERTY_STATUS].str.contains("doing", case=False, na=False)
-        ]
-    )
-    todo = len(
-        tasks_df[
-            tasks_df[NOTION_PROPERTY_STATUS].str.contains("to do", case=False, na=False)
-        ]
-    )
+    # Count each distinct status once, then match the (few) labels instead of every row
+    status_counts = tasks_df["Status_Norm"].value_counts()
+    labels = status_counts.index.astype(str)
+    completed = int(status_counts[labels.str.contains("done")].sum())
+    doing = int(status_counts[labels.str.contains("doing")].sum())
+    todo = int(status_counts[labels.str.contains("to do")].sum())
 
     print(f"Total Database Items: {total_tasks}")
     print(f"├─ Completed: {completed}")
@@ -379,12 +439,8 @@ def analyze_task_summary(tasks_df: pd.DataFrame):
     print(f"└─ To Do: {todo}")
 
 
-def analyze_task_dates(tasks_df: pd.DataFrame):
-    today = pd.Timestamp.now().tz_localize(None)
-    incomplete = tasks_df[
-        (tasks_df[NOTION_PROPERTY_STATUS].str.lower().isin(["to do", "doing"]))
-        & (tasks_df["Is_Project"] == False)
-    ]
+def analyze_task_dates(tasks_df: pd.DataFrame, today: pd.Timestamp):
+    incomplete = tasks_df[tasks_df["Is_Actionable"]]
     overdue = incomplete[incomplete["Due Date"] < today]
 
     if not overdue.empty:
@@ -395,8 +451,7 @@ def analyze_task_dates(tasks_df: pd.DataFrame):
 def analyze_task_priorities(tasks_df: pd.DataFrame):
     critical_high = tasks_df[
         (tasks_df["Priority_Score"] <= 1)  # Critical=0, High=1
-        & (tasks_df[NOTION_PROPERTY_STATUS].str.lower().isin(["to do", "doing"]))
-        & (tasks_df["Is_Project"] == False)
+        & tasks_df["Is_Actionable"]
     ]
 
     if not critical_high.empty:
@@ -405,37 +460,38 @@ def analyze_task_priorities(tasks_df: pd.DataFrame):
 
 
 def analyze_upcoming_tasks(tasks_df: pd.DataFrame):
-    pending_tasks = tasks_df[
-        (tasks_df[NOTION_PROPERTY_STATUS].str.lower().isin(["to do", "doing"]))
-        & (tasks_df["Is_Project"] == False)
-    ]
+    pending_tasks = tasks_df[tasks_df["Is_Actionable"]]
     oldest_pending = pending_tasks.nsmallest(5, "Created Date")
 
     print(file_header("👴 Oldest Stagnant Tasks"))
     cols = ["NID", "Name", "Created", "Priority", "Due"]
-    display = oldest_pending.copy()
-    display["Name"] = display["Name"].apply(TextHelper.truncate_text)
-    display["Due"] = display["Due"].fillna("None")
-    print(display[cols].to_string(index=False))
+    display = oldest_pending[cols].assign(
+        Name=oldest_pending["Name_Display"], Due=oldest_pending["Due"].fillna("None")
+    )
+    print(display.to_string(index=False))
 
 
 def generate_charts(tasks_df: pd.DataFrame):
     """Generates helpful visualization charts for reports."""
     try:
-        sns.set(style="whitegrid")
-
+        plt, sns = load_plotting()
         # --- Chart 1: Weekly Velocity (Tasks Completed per Week) ---
         completed_tasks = tasks_df[
-            (tasks_df[NOTION_PROPERTY_STATUS].str.lower() == "done")
-            & (tasks_df["Completed"].notna())
-        ].copy()
+            (tasks_df["Status_Norm"] == "done") & (tasks_df["Completed Date"].notna())
+        ]
 
         if not completed_tasks.empty:
-            completed_tasks["Completed"] = pd.to_datetime(
-                completed_tasks["Completed"], format="mixed", errors="coerce", utc=True
-            ).dt.tz_localize(None)
-
-            weekly_counts = completed_tasks.resample("W-MON", on="Completed").size()
+            # Same buckets as resample("W-MON"): each day counts toward the week
+            # ending on the next Monday (inclusive), computed with one integer
+            # division and a bincount instead of a resample grouper
+            days = completed_tasks["Completed Date"].to_numpy("datetime64[D]")
+            week = -(-(days - WEEK_EPOCH_MONDAY).astype("int64") // 7)
+            first_week = week.min()
+            counts = np.bincount(week - first_week)
+            week_ends = WEEK_EPOCH_MONDAY + np.timedelta64(7, "D") * (
+                first_week + np.arange(len(counts))
+            )
+            weekly_counts = pd.Series(counts, index=pd.DatetimeIndex(week_ends))
             last_12_weeks = weekly_counts.tail(12)
 
             plt.figure(figsize=(10, 5))
@@ -465,15 +521,18 @@ def generate_charts(tasks_df: pd.DataFrame):
         # --- Chart 2: Status Distribution (Global) ---
         status_counts = tasks_df[NOTION_PROPERTY_STATUS].value_counts()
         if not status_counts.empty:
+            # Percentages go straight into the labels instead of an autopct callback
+            percents = status_counts / status_counts.sum() * 100
+            labels = [f"{status} ({pct:.1f}%)" for status, pct in percents.items()]
             plt.figure(figsize=(6, 6))
             plt.pie(
                 status_counts,
-                labels=status_counts.index,
-                autopct="%1.1f%%",
+                labels=labels,
                 startangle=140,
                 colors=sns.color_palette("pastel"),
             )
             plt.title("All-Time Task Status")
+            plt.tight_layout()  # Keep the longer "status (pct%)" labels inside the figure
             plt.savefig(TASKS_BY_STATUS_PLOT_PATH)
             plt.close()
             PrintStyle.print_saved("Chart", TASKS_BY_STATUS_PLOT_PATH)
@@ -482,7 +541,8 @@ def generate_charts(tasks_df: pd.DataFrame):
         priority_counts = tasks_df["Priority"].value_counts()
         if not priority_counts.empty:
             plt.figure(figsize=(8, 6))
-            sns.barplot(x=priority_counts.index, y=priority_counts.values)
+            # Plain labels keep the bars in count order (a categorical x would re-sort them)
+            sns.barplot(x=priority_counts.index.astype(str), y=priority_counts.values)
             plt.title("All-Time Task Priority")
             plt.savefig(TASKS_BY_PRIORITY_PLOT_PATH)
             plt.close()
@@ -493,4 +553,5 @@ def generate_charts(tasks_df: pd.DataFrame):
 
 
 if __name__ == "__main__":
-    analyze_tasks()
+    # "--no-charts" writes only the text analysis and skips the plotting stack
+    analyze_tasks(make_charts="--no-charts" not in sys.argv[1:])
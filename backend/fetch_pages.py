@@ -1,9 +1,13 @@
 # backend/fetch_pages.py
 import aiohttp
+import ast
 import asyncio
+import hashlib
 import os
 import pandas as pd
 import json
+import random
+import uuid
 from tqdm import tqdm
 from backend.text_style import PrintStyle
 from backend.globals import (
@@ -13,6 +17,7 @@ from backend.globals import (
     PAGES_CSV_FILE_PATH,
     PAGES_JSON_FILE_PATH,
     PAGES_ATTACHMENT_DIR,
+    SCHEMA_HASH_FILE_PATH,
     NOTION_PROPERTY_NID,
     NOTION_PROPERTY_STATUS,
     NOTION_PROPERTY_STARTED,
@@ -33,6 +38,67 @@ headers = {
 # Standard Notion property for the title is usually "Name" or "title"
 NOTION_PROPERTY_NAME = "Name"
 nid_cache = {}
+# Pages processed at the same time (each one issues several API requests)
+MAX_CONCURRENT_PAGES = 20
+# Bytes read per chunk when streaming attachments to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Task fields holding lists; the CSV cache stores them as their Python repr
+LIST_FIELDS = ("Files & Media", "Children UIDs", "Children NIDs", "Active Tags")
+# Markdown markers for rich-text annotations, from innermost to outermost
+ANNOTATION_MARKERS = (
+    ("bold", "**"),
+    ("italic", "*"),
+    ("underline", "__"),
+    ("strikethrough", "~~"),
+)
+# Attempts per Notion API request before giving up on rate limits/server errors
+MAX_RETRIES = 5
+
+
+async def request_with_retry(session, method, url, **kwargs):
+    """Send a Notion API request, retrying rate limits (429, honoring Retry-After)
+    and transient server/connection errors with exponential back-off.
+    Returns (response, data): parsed JSON on 200, otherwise the response text."""
+    for attempt in range(1, MAX_RETRIES + 1):
+        try:
+            async with session.request(
+                method, url, headers=headers, **kwargs
+            ) as response:
+                if response.status == 200:
+                    return response, await response.json()
+                if response.status == 429 and attempt < MAX_RETRIES:
+                    retry_after = int(response.headers.get("Retry-After", 1))
+                    print(
+                        f"{PrintStyle.YELLOW}Rate limit reached. Retrying after {retry_after} seconds...{PrintStyle.RESET}"
+                    )
+                    await asyncio.sleep(retry_after)
+                    continue
+                if response.status < 500 or attempt == MAX_RETRIES:
+                    return response, await response.text()
+                print(
+                    f"{PrintStyle.RED}Server error {response.status} {response.reason}. Retrying... ({attempt}/{MAX_RETRIES}){PrintStyle.RESET}"
+                )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            if attempt == MAX_RETRIES:
+                raise
+            print(
+                f"{PrintStyle.RED}Connection error: {e}. Retrying... ({attempt}/{MAX_RETRIES}){PrintStyle.RESET}"
+            )
+        # Exponential back-off with a little jitter so concurrent pages spread out
+        await asyncio.sleep(2**attempt + random.uniform(0, 0.5))
+
+
+async def gather_or_cancel(*aws):
+    """Like asyncio.gather, but when one awaitable fails the others are cancelled
+    and awaited before the error propagates, so none outlive the session."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
 
 
 async def fetch_page_nid(page_id, session):
@@ -40,28 +106,31 @@ async def fetch_page_nid(page_id, session):
     NID' is the numeric ID of a page. Different than 'ID' which is called 'UID' here."""
     if not page_id:
         return None
-    if page_id in nid_cache:
+    if page_id in nid_cache:  # Seeded from the local CSV cache and the database query
         return nid_cache[page_id]
-    # Check if the NID exists in the local CSV cache before calling the API
-    if "existing_tasks_df" in globals() and globals()["existing_tasks_df"] is not None:
-        if page_id in globals()["existing_tasks_df"].index:
-            cached_nid = globals()["existing_tasks_df"].at[page_id, "NID"]
-            nid_cache[page_id] = cached_nid
-            return cached_nid
     url = f"https://api.notion.com/v1/pages/{page_id}"
-    async with session.get(url, headers=headers) as response:
-        if response.status == 200:
-            page_data = await response.json()
-            properties = page_data.get("properties", {})
-            # Use the global variable for NID
-            nid = safe_get(properties, NOTION_PROPERTY_NID, "unique_id", "number")
-            nid_cache[page_id] = nid
-            return nid
-        else:
-            print(
-                f"{PrintStyle.RED}Failed to fetch page {page_id}: {response.status}{PrintStyle.RESET}"
-            )
-            return None
+    response, page_data = await request_with_retry(session, "GET", url)
+    if response.status == 200:
+        properties = page_data.get("properties", {})
+        # Use the global variable for NID
+        nid = safe_get(properties, NOTION_PROPERTY_NID, "unique_id", "number")
+        nid_cache[page_id] = nid
+        return nid
+    else:
+        print(
+            f"{PrintStyle.RED}Failed to fetch page {page_id}: {response.status}{PrintStyle.RESET}"
+        )
+        return None
+
+
+def prime_nid_cache(pages):
+    """Fill the NID cache from pages already returned by the database query, so
+    parent/child lookups within the same database need no extra API call."""
+    for page in pages:
+        properties = page.get("properties", {})
+        nid_cache[page.get("id")] = safe_get(
+            properties, NOTION_PROPERTY_NID, "unique_id", "number"
+        )
 
 
 async def fetch_all_pages(session, limit=None):
@@ -81,41 +150,41 @@ async def fetch_all_pages(session, limit=None):
             payload["page_size"] = 100
 
         try:
-            async with session.post(url, headers=headers, json=payload) as response:
-                if response.status == 404:
-                    print(
-                        f"{PrintStyle.RED}CRITICAL ERROR: Database not found (404).{PrintStyle.RESET}"
-                    )
-                    print(
-                        f"{PrintStyle.YELLOW}1. Check if NOTION_DATABASE_ID in .env is correct.{PrintStyle.RESET}"
-                    )
-                    print(
-                        f"{PrintStyle.YELLOW}2. Ensure the integration is added to the database connections.{PrintStyle.RESET}"
-                    )
-                    # Return empty list to stop execution safely without crashing
-                    return []
-                if response.status != 200:
-                    response_text = await response.text()
-                    print(
-                        f"{PrintStyle.RED}Error fetching tasks: {response.status} {response.reason}: {response_text}{PrintStyle.RESET}"
-                    )
-                    response.raise_for_status()
-                data = await response.json()
-                results = data.get("results", [])
-                all_tasks.extend(results)
-                total_fetched += len(results)
-                if limit and total_fetched >= limit:
-                    break
-                has_more = data.get("has_more", False)
-                next_cursor = data.get("next_cursor", None)
+            response, data = await request_with_retry(
+                session, "POST", url, json=payload
+            )
+            if response.status == 404:
+                print(
+                    f"{PrintStyle.RED}CRITICAL ERROR: Database not found (404).{PrintStyle.RESET}"
+                )
+                print(
+                    f"{PrintStyle.YELLOW}1. Check if NOTION_DATABASE_ID in .env is correct.{PrintStyle.RESET}"
+                )
+                print(
+                    f"{PrintStyle.YELLOW}2. Ensure the integration is added to the database connections.{PrintStyle.RESET}"
+                )
+                # Return empty list to stop execution safely without crashing
+                return []
+            if response.status != 200:
+                print(
+                    f"{PrintStyle.RED}Error fetching tasks: {response.status} {response.reason}: {data}{PrintStyle.RESET}"
+                )
+                response.raise_for_status()
+            results = data.get("results", [])
+            all_tasks.extend(results)
+            total_fetched += len(results)
+            if limit and total_fetched >= limit:
+                break
+            has_more = data.get("has_more", False)
+            next_cursor = data.get("next_cursor", None)
         except Exception as e:
             print(f"{PrintStyle.RED}Exception occurred: {e}{PrintStyle.RESET}")
             raise
     return all_tasks
 
 
-async def fetch_page_blocks(block_id, session):
-    """Recursively fetch all blocks for a given block_id, including nested blocks."""
+async def fetch_block_children(block_id, session):
+    """Fetch the direct children of a block, following pagination."""
     blocks = []
     url = f"https://api.notion.com/v1/blocks/{block_id}/children"
     has_more = True
@@ -124,49 +193,35 @@ async def fetch_page_blocks(block_id, session):
         params = {"page_size": 100}
         if next_cursor:
             params["start_cursor"] = next_cursor
-        retry_count = 0  # Retry mechanism for handling rate limits
-        while retry_count < 5:
-            try:
-                async with session.get(url, headers=headers, params=params) as response:
-                    if response.status == 429:  # Rate limit error
-                        retry_count += 1
-                        retry_after = int(response.headers.get("Retry-After", 1))
-                        print(
-                            f"{PrintStyle.YELLOW}Rate limit reached. Retrying after {retry_after} seconds...{PrintStyle.RESET}"
-                        )
-                        await asyncio.sleep(retry_after)
-                        continue  # To retry the request
-                    elif response.status != 200:
-                        response_text = await response.text()
-                        print(
-                            f"{PrintStyle.RED}Error fetching page blocks: {response.status} {response.reason}: {response_text}{PrintStyle.RESET}"
-                        )
-                        response.raise_for_status()
-                    data = await response.json()
-                    results = data.get("results", [])
-                    blocks.extend(results)
-                    has_more = data.get("has_more", False)  # Check for pagination
-                    next_cursor = data.get("next_cursor", None)
-                    tasks = (
-                        []
-                    )  # Recursively fetch child blocks for each block that has children
-                    for block in results:
-                        if block.get("has_children", False):
-                            tasks.append(fetch_page_blocks(block["id"], session))
-                    if tasks:
-                        child_blocks_list = await asyncio.gather(*tasks)
-                        for block, children in zip(results, child_blocks_list):
-                            block["children"] = children
-                    break  # Exit retry loop on success
-            except aiohttp.ClientResponseError as e:
-                retry_count += 1
-                print(
-                    f"{PrintStyle.RED}ClientResponseError {e.status}: {e.message}. Retrying... ({retry_count}/5){PrintStyle.RESET}"
-                )
-                await asyncio.sleep(2**retry_count)  # Exponential back-off
-            except Exception as e:
-                print(f"{PrintStyle.RED}Unexpected error: {e}{PrintStyle.RESET}")
-                raise
+        # Rate limits and transient errors are retried by request_with_retry
+        response, data = await request_with_retry(session, "GET", url, params=params)
+        if response.status != 200:
+            print(
+                f"{PrintStyle.RED}Error fetching page blocks: {response.status} {response.reason}: {data}{PrintStyle.RESET}"
+            )
+            break  # Keep the blocks fetched so far instead of re-requesting forever
+        blocks.extend(data.get("results", []))
+        has_more = data.get("has_more", False)  # Check for pagination
+        next_cursor = data.get("next_cursor", None)
+    return blocks
+
+
+async def fetch_page_blocks(block_id, session):
+    """Fetch all blocks for a given block_id, including nested blocks.
+    Nesting is walked level by level, fetching each level's children in one batch."""
+    blocks = await fetch_block_children(block_id, session)
+    level = [block for block in blocks if block.get("has_children", False)]
+    while level:
+        children_lists = await gather_or_cancel(
+            *(fetch_block_children(block["id"], session) for block in level)
+        )
+        next_level = []
+        for block, children in zip(level, children_lists):
+            block["children"] = children
+            next_level.extend(
+                child for child in children if child.get("has_children", False)
+            )
+        level = next_level
     return blocks
 
 
@@ -176,14 +231,13 @@ async def fetch_comments(page_id, session):
     url = f"https://api.notion.com/v1/comments"
     params = {"block_id": page_id}
     try:
-        async with session.get(url, headers=headers, params=params) as response:
-            if response.status == 200:
-                data = await response.json()
-                comments = data.get("results", [])
-            else:
-                print(
-                    f"{PrintStyle.RED}Failed to fetch comments for page {page_id}: {response.status} - {await response.text()}{PrintStyle.RESET}"
-                )
+        response, data = await request_with_retry(session, "GET", url, params=params)
+        if response.status == 200:
+            comments = data.get("results", [])
+        else:
+            print(
+                f"{PrintStyle.RED}Failed to fetch comments for page {page_id}: {response.status} - {data}{PrintStyle.RESET}"
+            )
     except Exception as e:
         print(
             f"{PrintStyle.RED}Exception occurred while fetching comments: {e}{PrintStyle.RESET}"
@@ -191,10 +245,14 @@ async def fetch_comments(page_id, session):
     return comments
 
 
-async def extract_page_blocks(blocks):
+def extract_page_blocks(blocks):
     """Extract text content from blocks, handling all supported block types, including nested blocks."""
     texts = []
-    for block in blocks:
+    # Walk the block tree with an explicit stack (pre-order: a block, then its
+    # children) so every block is visited exactly once, without recursion
+    stack = list(reversed(blocks))
+    while stack:
+        block = stack.pop()
         if not isinstance(block, dict):
             continue
         block_type = block.get("type")
@@ -212,20 +270,23 @@ async def extract_page_blocks(blocks):
             "callout",
         ]:
             text_items = block[block_type].get("rich_text", [])
+            text_parts = []
             for item in text_items:
-                plain_text = item.get("plain_text", "")
                 annotations = item.get("annotations", {})
-                if annotations.get("bold"):  # Apply formatting for annotations
-                    plain_text = f"**{plain_text}**"
-                if annotations.get("italic"):
-                    plain_text = f"*{plain_text}*"
-                if annotations.get("underline"):
-                    plain_text = f"__{plain_text}__"
-                if annotations.get("strikethrough"):
-                    plain_text = f"~~{plain_text}~~"
+                # Apply formatting for annotations in one join: markers nest in
+                # ANNOTATION_MARKERS order (bold innermost), so they open reversed
+                markers = [
+                    marker
+                    for name, marker in ANNOTATION_MARKERS
+                    if annotations.get(name)
+                ]
+                plain_text = "".join(
+                    [*reversed(markers), item.get("plain_text", ""), *markers]
+                )
                 if item.get("href"):
                     plain_text = f"[{plain_text}]({item['href']})"
-                block_text += plain_text
+                text_parts.append(plain_text)
+            block_text = "".join(text_parts)
             if block_text.strip():
                 texts.append(block_text)
         elif block_type == "to_do":  # Handle to-do blocks (checkbox items)
@@ -249,9 +310,7 @@ async def extract_page_blocks(blocks):
             block_text = f"[Code: {language}]\n{code_text}"
             texts.append(block_text)
         elif block_type == "table" and block.get("children"):  # Handle tables and rows
-            texts.append("Table:")
-            child_texts = await extract_page_blocks(block["children"])
-            texts.extend(child_texts)
+            texts.append("Table:")  # The rows follow as this block's children
         elif block_type == "table_row":
             row_cells = block[block_type].get("cells", [])
             row_text = [
@@ -292,8 +351,7 @@ async def extract_page_blocks(blocks):
         elif block_type == "synced_block" and block.get(
             "children"
         ):  # Handle synced blocks
-            synced_content = await extract_page_blocks(block["children"])
-            texts.extend(synced_content)
+            pass  # The synced content is read below as this block's children
         elif block_type == "unsupported":  # Handle unsupported and unhandled blocks
             block_text = "[Unsupported block]"
             texts.append(block_text)
@@ -302,9 +360,8 @@ async def extract_page_blocks(blocks):
             texts.append(block_text)
         if (
             "children" in block and block["children"]
-        ):  # Recursively process children blocks if present
-            child_texts = await extract_page_blocks(block["children"])
-            texts.extend(child_texts)
+        ):  # Process children blocks next, in their original order
+            stack.extend(reversed(block["children"]))
     return texts
 
 
@@ -335,10 +392,6 @@ async def process_page(result, session):
         title_items = title_prop["title"]
         title = "".join(item.get("plain_text", "") for item in title_items)
 
-    page_blocks = await fetch_page_blocks(page_id, session)
-    page_content_texts = await extract_page_blocks(page_blocks)
-    page_content_str = "\n".join(page_content_texts)
-
     NID = safe_get(properties, NOTION_PROPERTY_NID, "unique_id", "number")
 
     # Use global variable for Files & Media
@@ -349,8 +402,6 @@ async def process_page(result, session):
     file_names = []
     attachment_dir = os.path.join(PAGES_ATTACHMENT_DIR, str(NID))
     download_tasks = []
-    if files_media:
-        attachment_dir = os.path.join(PAGES_ATTACHMENT_DIR, str(NID))
     for file in files_media:
         # ... existing file download logic ...
         file_name = file.get("name")
@@ -362,24 +413,30 @@ async def process_page(result, session):
         if file_url:
             file_name = sanitize_filename(file_name)
             file_path = os.path.join(attachment_dir, file_name)
+            file_names.append(file_name)
             download_tasks.append(
-                asyncio.create_task(download_file(file_url, file_path, session))
+                download_file(file_url, file_path, session)
             )  # Add download task for async processing
-            file_names.append(file_name)
     if download_tasks:
-        download_results = await asyncio.gather(*download_tasks)
-        if any(download_results):
-            os.makedirs(attachment_dir, exist_ok=True)
+        os.makedirs(attachment_dir, exist_ok=True)
 
     # Fetch Parent NID and Children NIDs using global variables
     parent_uid = safe_get(properties, NOTION_PROPERTY_PARENT_ITEM, "relation", 0, "id")
-    parent_nid = await fetch_page_nid(parent_uid, session) if parent_uid else None
-
     children_uids = [
         item["id"]
         for item in safe_get(properties, NOTION_PROPERTY_SUB_ITEM, "relation") or []
     ]
-    children_nids = [await fetch_page_nid(uid, session) for uid in children_uids]
+    # Blocks, comments, NIDs and downloads are independent requests, so they all
+    # run together (fetch_page_nid returns None straight away for a missing parent)
+    page_blocks, comments, parent_nid, children_nids, _ = await gather_or_cancel(
+        fetch_page_blocks(page_id, session),
+        fetch_comments(page_id, session),
+        fetch_page_nid(parent_uid, session),
+        gather_or_cancel(*(fetch_page_nid(uid, session) for uid in children_uids)),
+        gather_or_cancel(*download_tasks),
+    )
+    page_content_texts = extract_page_blocks(page_blocks)
+    page_content_str = "\n".join(page_content_texts)
 
     # Fetch Active Tags (Formula)
     # Formulas can return string, number, boolean, or date.
@@ -409,7 +466,6 @@ async def process_page(result, session):
                         [t["name"] for t in item.get("multi_select", [])]
                     )
 
-    comments = await fetch_comments(page_id, session)
     comment_texts = [
         comment["rich_text"][0].get("plain_text", "")
         for comment in comments
@@ -442,13 +498,32 @@ async def process_page(result, session):
 
 
 async def download_file(url, path, session):
-    """Download a file from a given URL."""
+    """Download a file from a given URL, keeping an existing copy of the same size."""
+    part_path = None
     try:
         async with session.get(url) as response:
             if response.status == 200:
-                os.makedirs(os.path.dirname(path), exist_ok=True)
-                with open(path, "wb") as f:
-                    f.write(await response.read())
+                # Signed URLs rotate, so the size is the check: when the remote
+                # Content-Length matches the local file, the body is never read
+                if (
+                    response.content_length is not None
+                    and os.path.exists(path)
+                    and os.path.getsize(path) == response.content_length
+                ):
+                    return True
+                # Stream to disk in chunks instead of holding the whole file in
+                # memory. The temp file gets a short generated name in the same
+                # folder, so a failed download never looks like a complete file
+                # and a name already near the 255-character limit still fits
+                part_path = os.path.join(
+                    os.path.dirname(path), f".{uuid.uuid4().hex}.part"
+                )
+                with open(part_path, "xb") as f:
+                    async for chunk in response.content.iter_chunked(
+                        DOWNLOAD_CHUNK_SIZE
+                    ):
+                        f.write(chunk)
+                os.replace(part_path, path)
                 return True
             else:
                 print(
@@ -456,15 +531,20 @@ async def download_file(url, path, session):
                 )
     except Exception as e:
         print(f"{PrintStyle.RED}Error downloading file ({url}): {e}{PrintStyle.RESET}")
+    finally:
+        # A download cut off mid-stream must not leave its partial file behind
+        if part_path and os.path.exists(part_path):
+            os.remove(part_path)
     return False
 
 
+# Characters that are invalid in file names, each mapped to "_" in one pass
+SANITIZE_FILENAME_TABLE = str.maketrans({char: "_" for char in '<>:"/\\|?*'})
+
+
 def sanitize_filename(filename):
     """Sanitize the filename to remove or replace invalid characters."""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, "_")
-    return filename[:255]
+    return filename.translate(SANITIZE_FILENAME_TABLE)[:255]
 
 
 # Add ANSI colors for terminal output
@@ -476,25 +556,36 @@ RESET = "\033[0m"
 BOLD = "\033[1m"
 
 
+# Map global variable names to the property name expected in Notion
+SCHEMA_CHECKS = [
+    ("Status", NOTION_PROPERTY_STATUS),
+    ("Priority", NOTION_PROPERTY_PRIORITY),
+    ("Due Date", NOTION_PROPERTY_DUE),
+    ("Started", NOTION_PROPERTY_STARTED),
+    ("Completed", NOTION_PROPERTY_COMPLETED),
+    ("Files", NOTION_PROPERTY_FILES_MEDIA),
+    ("Active Tags", NOTION_PROPERTY_ACTIVE_TAGS),
+    # ("NID", NOTION_PROPERTY_NID),
+    # ("Parent Item", NOTION_PROPERTY_PARENT_ITEM),
+    # ("Sub-item", NOTION_PROPERTY_SUB_ITEM),
+]
+
+
+def schema_fingerprint(first_task_properties):
+    """Return a stable hash of the Notion property names and the configured checks."""
+    names = sorted(first_task_properties.keys())
+    payload = json.dumps([names, SCHEMA_CHECKS])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def check_schema_health(first_task_properties):
     """
     Checks if the properties defined in .env actually exist in the Notion database.
+    Returns the number of configured properties that are missing.
     """
     PrintStyle.print_header("DATABASE SCHEMA INTEGRITY CHECK")
 
-    # Map global variable names to the property name expected in Notion
-    checks = [
-        ("Status", NOTION_PROPERTY_STATUS),
-        ("Priority", NOTION_PROPERTY_PRIORITY),
-        ("Due Date", NOTION_PROPERTY_DUE),
-        ("Started", NOTION_PROPERTY_STARTED),
-        ("Completed", NOTION_PROPERTY_COMPLETED),
-        ("Files", NOTION_PROPERTY_FILES_MEDIA),
-        ("Active Tags", NOTION_PROPERTY_ACTIVE_TAGS),
-        # ("NID", NOTION_PROPERTY_NID),
-        # ("Parent Item", NOTION_PROPERTY_PARENT_ITEM),
-        # ("Sub-item", NOTION_PROPERTY_SUB_ITEM),
-    ]
+    checks = SCHEMA_CHECKS
 
     missing_count = 0
 
@@ -537,6 +628,7 @@ def check_schema_health(first_task_properties):
     PrintStyle.print_saved("Raw JSON", PAGES_JSON_FILE_PATH)
     PrintStyle.print_divider()
     print("")
+    return missing_count
 
 
 async def fetch_and_process_pages(limit=None):
@@ -544,42 +636,83 @@ async def fetch_and_process_pages(limit=None):
     print(
         f"{PrintStyle.CYAN}Fetching tasks from Notion (limit: {limit or 'no limit'})...{PrintStyle.RESET}"
     )
-    global existing_tasks_df
-    existing_tasks_df = None
+    updated_map = {}
     cache_file = PAGES_CSV_FILE_PATH
     if os.path.exists(cache_file):  # Load existing data if available
-        existing_tasks_df = pd.read_csv(cache_file)
+        # Only the NID and change-detection columns are needed, not the page contents
+        existing_tasks_df = pd.read_csv(
+            cache_file, usecols=["UID", "NID", "Updated Time"]
+        )
         existing_tasks_df.set_index("UID", inplace=True)
-    async with aiohttp.ClientSession() as session:
+        # Plain dicts make the per-page lookups below cheap
+        updated_map = existing_tasks_df["Updated Time"].to_dict()
+        nid_cache.update(existing_tasks_df["NID"].dropna().to_dict())
+    # Keep-alive pool sized for the concurrent page processing below; connections
+    # to api.notion.com are reused instead of re-doing DNS/TLS per request
+    connector = aiohttp.TCPConnector(
+        limit=64, limit_per_host=32, ttl_dns_cache=300, keepalive_timeout=75
+    )
+    async with aiohttp.ClientSession(connector=connector) as session:
         all_tasks = await fetch_all_pages(session, limit=limit)
+        prime_nid_cache(all_tasks)
         if all_tasks:
             first_page_props = all_tasks[0].get("properties", {})
-            check_schema_health(first_page_props)
+            # The full report is only printed when the schema changed since the
+            # last clean check; a mismatch keeps being reported until it is fixed
+            fingerprint = schema_fingerprint(first_page_props)
+            previous = None
+            if os.path.exists(SCHEMA_HASH_FILE_PATH):
+                with open(SCHEMA_HASH_FILE_PATH, "r", encoding="utf-8") as f:
+                    previous = f.read().strip()
+            if fingerprint == previous:
+                PrintStyle.print_success(
+                    "Unchanged since the last check.", label="SCHEMA"
+                )
+            elif check_schema_health(first_page_props) == 0:
+                os.makedirs(os.path.dirname(SCHEMA_HASH_FILE_PATH), exist_ok=True)
+                with open(SCHEMA_HASH_FILE_PATH, "w", encoding="utf-8") as f:
+                    f.write(fingerprint)
         else:
             PrintStyle.print_warning(
                 "No tasks found in database. Cannot verify schema."
             )
-        tasks = []
         total_tasks = len(all_tasks)
         with tqdm(
             total=total_tasks, unit="task", dynamic_ncols=True, leave=True
         ) as pbar:
+            changed_pages = []
             for result in all_tasks:
                 page_id = result.get("id")
                 last_edited_time = result.get("last_edited_time")
-                if (  # Skip unchanged tasks if cached
-                    existing_tasks_df is not None
-                    and page_id in existing_tasks_df.index
-                    and existing_tasks_df.loc[page_id, "Updated Time"]
-                    == last_edited_time
-                ):
+                # Skip unchanged tasks if cached
+                if page_id in updated_map and updated_map[page_id] == last_edited_time:
                     pbar.update(1)
                     continue
-                task = await process_page(
-                    result, session
-                )  # Process page if new or updated
-                tasks.append(task)
+                changed_pages.append(result)
+
+            # Process new or updated pages concurrently; the semaphore bounds how
+            # many pages have requests in flight at once
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGES)
+
+            async def process_with_limit(result):
+                async with semaphore:
+                    try:
+                        task = await process_page(result, session)
+                    except Exception as e:
+                        # One failing page must not abort the others; it is not
+                        # cached, so the next run fetches it again
+                        print(
+                            f"{PrintStyle.RED}Skipping page {result.get('id')}: {e!r}{PrintStyle.RESET}"
+                        )
+                        task = None
                 pbar.update(1)
+                return task
+
+            # gather keeps the results in the original page order
+            tasks = await asyncio.gather(
+                *(process_with_limit(result) for result in changed_pages)
+            )
+            tasks = [task for task in tasks if task is not None]
 
     print(
         f"{PrintStyle.GREEN}✔️  Finished fetching {len(tasks)} tasks!{PrintStyle.RESET}"
@@ -593,6 +726,16 @@ def save_tasks_to_csv(new_tasks, cache_file=PAGES_CSV_FILE_PATH):
         return
     new_tasks_df = pd.DataFrame(new_tasks)
     if os.path.exists(cache_file):
+        # Pages that are new to the cache are appended without rewriting the file;
+        # the full merge is only needed when cached pages were updated
+        cached_columns = pd.read_csv(cache_file, nrows=0).columns
+        cached_uids = pd.read_csv(cache_file, usecols=["UID"])["UID"]
+        if (
+            cached_columns.equals(new_tasks_df.columns)
+            and not new_tasks_df["UID"].isin(cached_uids).any()
+        ):
+            new_tasks_df.to_csv(cache_file, mode="a", header=False, index=False)
+            return
         existing_df = pd.read_csv(cache_file)
         if not new_tasks_df.empty:
             merged_df = pd.concat([existing_df, new_tasks_df]).drop_duplicates(
@@ -603,6 +746,63 @@ def save_tasks_to_csv(new_tasks, cache_file=PAGES_CSV_FILE_PATH):
         new_tasks_df.to_csv(cache_file, index=False)
 
 
+def load_cached_tasks(cache_file=PAGES_CSV_FILE_PATH):
+    """Read the CSV cache back into task dicts shaped like process_page's output."""
+    cached_df = pd.read_csv(cache_file)
+    tasks = cached_df.astype(object).where(cached_df.notna(), None).to_dict("records")
+    for task in tasks:
+        for field in LIST_FIELDS:
+            if isinstance(task.get(field), str):
+                try:
+                    task[field] = ast.literal_eval(task[field])
+                except (ValueError, SyntaxError):
+                    pass
+        for field in ("NID", "Parent NID"):  # Columns with gaps are read as floats
+            if isinstance(task.get(field), float) and task[field].is_integer():
+                task[field] = int(task[field])
+        for field in ("Body Content", "Comments"):  # Empty strings come back as NaN
+            if task.get(field) is None:
+                task[field] = ""
+    return tasks
+
+
+def save_tasks_to_json(
+    new_tasks, json_file=PAGES_JSON_FILE_PATH, cache_file=PAGES_CSV_FILE_PATH
+):
+    """Merge new or updated tasks into the JSON file, keeping list fields as lists.
+    The JSON mirrors the CSV cache and is rebuilt from it whenever the two differ."""
+    tasks_by_uid = {}
+    if os.path.exists(json_file):
+        try:
+            with open(json_file, "r", encoding="utf-8") as f:
+                tasks_by_uid = {task["UID"]: task for task in json.load(f)}
+        except (ValueError, KeyError, TypeError):
+            tasks_by_uid = {}  # Unreadable, so rebuilt from the CSV below
+    for task in new_tasks:  # Updated tasks move to the end, as in the CSV
+        tasks_by_uid.pop(task["UID"], None)
+        tasks_by_uid[task["UID"]] = task
+    cached_uids = []
+    if os.path.exists(cache_file):
+        cached_uids = pd.read_csv(cache_file, usecols=["UID"])["UID"].tolist()
+    # A missing or out-of-date JSON (e.g. a run that stopped after saving the CSV)
+    # or one holding list fields as strings is rebuilt from the full CSV cache
+    in_sync = list(tasks_by_uid) == cached_uids and not any(
+        isinstance(task.get(field), str)
+        for task in tasks_by_uid.values()
+        for field in LIST_FIELDS
+    )
+    if not in_sync and os.path.exists(cache_file):
+        new_by_uid = {task["UID"]: task for task in new_tasks}
+        tasks_by_uid = {
+            task["UID"]: new_by_uid.get(task["UID"], task)
+            for task in load_cached_tasks(cache_file)
+        }
+    elif not new_tasks and os.path.exists(json_file):
+        return
+    with open(json_file, "w", encoding="utf-8") as f:
+        json.dump(list(tasks_by_uid.values()), f, indent=4)
+
+
 async def fetch_pages(limit=10):
     os.makedirs(os.path.dirname(DATA_DIR), exist_ok=True)
     tasks = await fetch_and_process_pages(limit)
@@ -616,8 +816,9 @@ async def fetch_pages(limit=10):
         print(
             f"{PrintStyle.YELLOW}ℹ️  No new or updated tasks to save.{PrintStyle.RESET}"
         )
-    tasks_df = pd.read_csv(PAGES_CSV_FILE_PATH)
-    tasks_df.to_json(PAGES_JSON_FILE_PATH, orient="records", indent=4)
+    save_tasks_to_json(
+        tasks, json_file=PAGES_JSON_FILE_PATH, cache_file=PAGES_CSV_FILE_PATH
+    )
 
 
 if __name__ == "__main__":
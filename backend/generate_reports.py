@@ -1,10 +1,15 @@
 # backend/generate_reports.py
 import pandas as pd
 import os
+import functools
 import datetime
 import re
 import ast
 import math
+import matplotlib
+
+# The report pie chart is written straight to PNG, no GUI backend needed
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import seaborn as sns
 from fpdf import FPDF
@@ -24,6 +29,26 @@ from backend.globals import (
     FILTER_TAGS,
 )
 
+# Only these CSV columns are used by the reports; the rest (Comments, UIDs, ...)
+# are skipped at read time. Body Content is added only when it is printed.
+REPORT_COLUMNS = {
+    "NID",
+    "Name",
+    "Status",
+    "Priority",
+    "Due",
+    "Created",
+    "Completed",
+    "Updated Time",
+    "Parent NID",
+    "Children NIDs",
+    "Active Tags",
+    "Files & Media",
+}
+
+# Markdown list items ("1. ", "- ", "* ") are indented a little further
+_BULLET_RE = re.compile(r"^(?:\d+\.|[-*])\s")
+
 
 class PDFReport(FPDF):
     def __init__(self, title_text, start_date_str, report_end_date_str):
@@ -69,7 +94,7 @@ class PDFReport(FPDF):
 
     def chapter_body(self, body):
         self.set_font("Arial", "", 10)
-        self.multi_cell(0, 5, safe_encode(TextHelper.clean_text(body)))
+        self.multi_cell(0, 5, clean_and_encode(body))
         self.ln(2)
 
     def footer(self):
@@ -89,7 +114,7 @@ class PDFReport(FPDF):
             full_display_name = f"[{parent_name}]: {task_name}"
         else:
             full_display_name = task_name
-        clean_name = safe_encode(TextHelper.clean_text(full_display_name))
+        clean_name = clean_and_encode(full_display_name)
         self.set_font("Arial", "B", 9)
         self.multi_cell(0, 5, f"{index + 1}. {clean_name}")
         if task_body and isinstance(task_body, str) and task_body.strip():
@@ -110,12 +135,13 @@ class PDFReport(FPDF):
             if not line:
                 continue
             current_indent = 15
-            if re.match(r"^(\d+\.|-|\*)\s", line):
+            if _BULLET_RE.match(line):
                 current_indent = 20
             self.set_x(current_indent)
-            parts = line.split("**")
+            # Most lines have no bold markers and are written as a single part
+            parts = line.split("**") if "**" in line else (line,)
             for i, part in enumerate(parts):
-                clean_part = safe_encode(TextHelper.clean_text(part))
+                clean_part = clean_and_encode(part)
                 if not clean_part:
                     continue
                 self.set_font("Arial", "B" if i % 2 == 1 else "", 9)
@@ -131,10 +157,31 @@ def safe_encode(text):
     return text.encode("latin-1", "replace").decode("latin-1")
 
 
+@functools.lru_cache(maxsize=16384)
+def clean_and_encode(text):
+    """
+    Cleans text for the PDF and makes it latin-1 safe.
+    Cached because reports repeat the same fragments (names, bold terms, bullets).
+    """
+    return safe_encode(TextHelper.clean_text(text))
+
+
 def get_tasks_df():
     if not os.path.exists(PAGES_CSV_FILE_PATH):
         return pd.DataFrame()
-    df = pd.read_csv(PAGES_CSV_FILE_PATH)
+    # Every report period reads the same CSV, so the cleaned frame is reused until
+    # the file changes; each caller gets its own copy to modify freely
+    stat = os.stat(PAGES_CSV_FILE_PATH)
+    return load_tasks_df(PAGES_CSV_FILE_PATH, stat.st_mtime_ns, stat.st_size).copy()
+
+
+@functools.lru_cache(maxsize=1)
+def load_tasks_df(csv_path, mtime_ns, size):
+    """Read and clean the tasks CSV. mtime_ns and size only key the cache."""
+    columns = (
+        REPORT_COLUMNS | {"Body Content"} if INCLUDE_BODY_CONTENT else REPORT_COLUMNS
+    )
+    df = pd.read_csv(csv_path, usecols=lambda c: c in columns)
     # Ensure columns exist to prevent KeyErrors later
     required_cols = [
         "Status",
@@ -159,13 +206,6 @@ def get_tasks_df():
 
     # Clean Parent NID (convert float to int/str for matching)
     df["NID"] = pd.to_numeric(df["NID"], errors="coerce").fillna(0).astype(int)
-    # Logic to fill missing Completed dates with Updated Time if the status is Done
-    # This fixes the issue where pages without explicit dates were behaving unpredictably
-    mask_done_no_date = (df["Status"].astype(str).str.lower().str.contains("done")) & (
-        df["Completed"].isna()
-    )
-    df.loc[mask_done_no_date, "Completed"] = df.loc[mask_done_no_date, "Updated Time"]
-
     df["Parent NID"] = (
         pd.to_numeric(df["Parent NID"], errors="coerce").fillna(0).astype(int)
     )
@@ -182,14 +222,15 @@ def get_tasks_df():
             except Exception:
                 return []
 
-        def match_tags(row):
-            # Only check the Active Tags column
-            active = parse_tags(row["Active Tags"])
-            if active:
-                return not set(active).isdisjoint(FILTER_TAGS)
-            return False
-
-        df = df[df.apply(match_tags, axis=1)]
+        # Only check the Active Tags column. Many rows share the same tag list,
+        # so parse each distinct string once and filter with a vectorized isin
+        filter_set = frozenset(FILTER_TAGS)
+        matching = [
+            tags
+            for tags in df["Active Tags"].dropna().unique()
+            if not filter_set.isdisjoint(parse_tags(tags))
+        ]
+        df = df[df["Active Tags"].isin(matching)]
 
     status_map = {
         "Canceled": "canceled",
@@ -204,6 +245,11 @@ def get_tasks_df():
     df["Status"] = df["Status"].fillna("unknown").astype(str)
     df["Status"] = df["Status"].replace(status_map).str.lower()
 
+    # Logic to fill missing Completed dates with Updated Time if the status is Done
+    # This fixes the issue where pages without explicit dates were behaving unpredictably
+    mask_done_no_date = df["Status"].eq("done") & df["Completed"].isna()
+    df.loc[mask_done_no_date, "Completed"] = df.loc[mask_done_no_date, "Updated Time"]
+
     priority_map = {
         "Critical (48hrs)": 0,
         "High (1wk)": 1,
@@ -214,6 +260,10 @@ def get_tasks_df():
     # Normalize Priority just in case
     df["Priority"] = df["Priority"].fillna("1 Note")
     df["Priority_Score"] = df["Priority"].map(priority_map).fillna(5)
+    # Both columns hold a handful of distinct labels, so categorical codes keep
+    # them small and make the per-report status comparisons integer compares
+    df["Status"] = df["Status"].astype("category")
+    df["Priority"] = df["Priority"].astype("category")
     return df
 
 
@@ -230,16 +280,23 @@ def generate_report_charts(goals, completed, in_progress):
         if combined_df.empty:
             return False
 
+        # Statuses absent from this report would otherwise count as empty wedges
         status_counts = combined_df["Status"].value_counts()
+        status_counts = status_counts[status_counts > 0]
         if status_counts.empty:
             return False
 
+        # Bake the percentage into each label rather than formatting it per wedge
+        percents = status_counts / status_counts.sum() * 100
+        labels = [
+            f"{status} ({pct:.1f}%)"
+            for status, pct in zip(status_counts.index.str.title(), percents)
+        ]
         plt.figure(figsize=(6, 6))
         colors = sns.color_palette("pastel")
         plt.pie(
             status_counts,
-            labels=status_counts.index.str.title(),
-            autopct="%1.1f%%",
+            labels=labels,
             startangle=140,
             colors=colors,
         )
@@ -320,16 +377,8 @@ def generate_pdf_report(period="weekly", report_start_date=None, report_end_date
     nid_to_name = df.set_index("NID")["Name"].to_dict()
 
     # Build a "Is Parent" lookup to identify container tasks
-    def has_children(x):
-        try:
-            val = ast.literal_eval(x) if isinstance(x, str) else x
-            return isinstance(val, list) and len(val) > 0
-        except Exception:
-            return False
-
-    parent_nids_set = set(
-        df[df["Children NIDs"].apply(has_children)]["NID"].astype(int)
-    )
+    has_children = TextHelper.has_list_items(df["Children NIDs"])
+    parent_nids_set = set(df.loc[has_children, "NID"].astype(int))
 
     # Determine reference date
     today = None
@@ -388,60 +437,29 @@ def generate_pdf_report(period="weekly", report_start_date=None, report_end_date
     end_str = today.strftime("%Y-%m-%d")
 
     # --- Filter Logic ---
-    # Goals (Date > Priority)
-    # We strictly respect the Start/End date even for To Do items if they have a Due Date
-    candidates = df[
-        (df["Status"] == "to do") & (df["Priority_Score"] <= 1)  # Critical=0, High=1
-    ]
-
-    # Split into dated and undated
-    dated_candidates = candidates[candidates["Due"].notna()]
-    undated_goals = candidates[candidates["Due"].isna()]
-
-    # Only include dated goals if they fall within or before the report period
-    # This prevents tasks due next year from cluttering this week's report
-    dated_goals = dated_candidates[dated_candidates["Due"] <= today]
-
-    goals = pd.concat([dated_goals, undated_goals]).sort_values("Due")
-
-    # Completed Logic: Now relies on the improved 'Completed' column (which falls back to Updated)
-    completed = df[
-        (df["Status"] == "done")
-        & (df["Completed"] >= start_date)
-        & (df["Completed"] <= today)
-    ]
-
-    # In Progress Logic
-    in_progress = df[df["Status"] == "doing"]
-    # Catch-all for tasks that don't fit the specific template statuses (e.g. if Status column is missing)
-    uncategorized = df[
-        ~df["Status"].isin(
-            ["to do", "doing", "done", "canceled", "duplicate", "notes", "paused"]
-        )
-    ]
+    # Split the tasks by status in one pass and look up every parent name once;
+    # each section below then works on its own slice
+    df["Parent Name"] = df["Parent NID"].map(nid_to_name)
+    by_status = dict(tuple(df.groupby("Status", sort=False, observed=True)))
+    no_tasks = df.iloc[0:0]
 
     # Helper to clean up lists
     def clean_task_list(task_df):
         if task_df.empty:
             return task_df
 
-        # Helper to check if body is effectively empty
-        def is_body_empty(row):
-            if not INCLUDE_BODY_CONTENT:
-                return True
-            content = str(row.get("Body Content", "")).strip()
-            return not content or content == "nan"
-
         # Filter out rows where NID is a Parent AND Body is Empty
-        mask = ~(
-            (task_df["NID"].isin(parent_nids_set))
-            & (task_df.apply(is_body_empty, axis=1))
-        )
-        return task_df[mask]
+        is_parent = task_df["NID"].isin(parent_nids_set)
+        if not INCLUDE_BODY_CONTENT:
+            return task_df[~is_parent]
+        # Body is effectively empty when missing, blank or the string "nan"
+        body = task_df["Body Content"].astype("string").str.strip()
+        is_body_empty = body.isna() | (body == "") | (body == "nan")
+        return task_df[~(is_parent & is_body_empty)]
 
     # 1. Goals (To Do) Logic
     # Filter by Status 'to do' first
-    raw_todos = df[df["Status"] == "to do"]
+    raw_todos = by_status.get("to do", no_tasks)
     raw_todos = clean_task_list(raw_todos)
 
     # Apply quantity-based filtering (Constraint: limit list if > 15)
@@ -466,36 +484,35 @@ def generate_pdf_report(period="weekly", report_start_date=None, report_end_date
         goals = raw_todos.copy()
 
     # Sort Goals: First by Parent Name (for grouping), then by Priority, then Due Date
-    goals["Parent Name"] = goals["Parent NID"].map(nid_to_name).fillna("")
+    goals["Parent Name"] = goals["Parent Name"].fillna("")
     goals = goals.sort_values(by=["Parent Name", "Priority_Score", "Due"])
 
     # 2. Completed Logic
     # Status is 'done' AND Completed Date is within the report period
-    completed = df[
-        (df["Status"] == "done")
-        & (df["Completed"] >= start_date)
-        & (df["Completed"] <= today)
-    ].copy()
-    completed = clean_task_list(completed)
+    completed = by_status.get("done", no_tasks)
+    completed = completed[
+        (completed["Completed"] >= start_date) & (completed["Completed"] <= today)
+    ]
+    completed = clean_task_list(completed).copy()
 
     # Sort for Grouping
-    completed["Parent Name"] = completed["Parent NID"].map(nid_to_name).fillna("")
+    completed["Parent Name"] = completed["Parent Name"].fillna("")
     completed = completed.sort_values(
         by=["Parent Name", "Completed"], ascending=[True, False]
     )
 
     # 3. In Progress Logic
     # Status is 'doing'
-    in_progress = df[df["Status"] == "doing"].copy()
-    in_progress = clean_task_list(in_progress)
+    in_progress = clean_task_list(by_status.get("doing", no_tasks)).copy()
 
     # Sort for Grouping
-    in_progress["Parent Name"] = (
-        in_progress["Parent NID"].map(nid_to_name).fillna("General / No Project")
+    in_progress["Parent Name"] = in_progress["Parent Name"].fillna(
+        "General / No Project"
     )
     in_progress = in_progress.sort_values(by=["Parent Name", "Priority_Score"])
 
     # 4. Uncategorized (Catch-all)
+    # Catch-all for tasks that don't fit the specific template statuses (e.g. if Status column is missing)
     uncategorized = df[
         ~df["Status"].isin(
             ["to do", "doing", "done", "canceled", "duplicate", "notes", "paused"]
@@ -526,24 +543,33 @@ def generate_pdf_report(period="weekly", report_start_date=None, report_end_date
     # Helper function to print grouped list
     def print_grouped_section(pdf_obj, data_df):
         current_group = None
+        # Walk the needed columns directly; iterrows() would box every row into a Series
+        bodies = (
+            data_df["Body Content"]
+            if INCLUDE_BODY_CONTENT and "Body Content" in data_df.columns
+            else [""] * len(data_df)
+        )
+        files = (
+            data_df["Files & Media"]
+            if "Files & Media" in data_df.columns
+            else [None] * len(data_df)
+        )
+        rows = zip(
+            data_df["Parent Name"], data_df["NID"], data_df["Name"], bodies, files
+        )
         # We assume data_df is already sorted by Parent Name
-        for i, (_, row) in enumerate(data_df.iterrows()):
-            group_name = row["Parent Name"]
-
+        for i, (group_name, nid, name, body, files_str) in enumerate(rows):
             # If the group changes, print a new header
             if group_name != current_group:
                 pdf_obj.add_group_header(group_name)
                 current_group = group_name
 
             # Prepare Body & Attachments
-            body = row.get("Body Content", "") if INCLUDE_BODY_CONTENT else ""
-            att_content = get_smart_attachment_content(
-                row["NID"], row.get("Files & Media")
-            )
+            att_content = get_smart_attachment_content(nid, files_str)
             full_body = (str(body) + str(att_content)).strip()
 
             # Add task item (Pass None for parent_name to avoid repeating the prefix)
-            pdf_obj.add_task_item(i, row["Name"], full_body, parent_name=None)
+            pdf_obj.add_task_item(i, name, full_body, parent_name=None)
 
     # Section 1: Completed
     pdf.chapter_title(1, "Completed Tasks")
@@ -572,8 +598,8 @@ def generate_pdf_report(period="weekly", report_start_date=None, report_end_date
         pdf.chapter_body(
             "These tasks do not match standard status filters (To Do, Doing, Done)."
         )
-        for i, (_, row) in enumerate(uncategorized.iterrows()):
-            pdf.add_task_item(i, row["Name"])
+        for i, name in enumerate(uncategorized["Name"]):
+            pdf.add_task_item(i, name)
 
     # Combined Analysis Section (Charts on the same page)
     chart_1_exists = generate_report_charts(goals, completed, in_progress)
@@ -47,6 +47,8 @@ PAGES_JSON_FILE_NAME = os.getenv("PAGES_JSON_FILE_NAME")
 PAGES_CSV_FILE_PATH = os.path.join(DATA_DIR, PAGES_CSV_FILE_NAME)
 PAGES_JSON_FILE_PATH = os.path.join(DATA_DIR, PAGES_JSON_FILE_NAME)
 PAGES_ATTACHMENT_DIR = os.path.join(DATA_DIR, "attachments")
+# SCHEMA_HASH_FILE_PATH stores a fingerprint of the last schema that passed the check.
+SCHEMA_HASH_FILE_PATH = os.path.join(DATA_DIR, ".schema_hash")
 # Paths for the analysis of pages:
 ANALYSIS_DIR = os.path.join(DATA_DIR, "analysis")
 # ANALYSIS_OUTPUT_FILE_PATH will store the analysis output in text format.
@@ -1,5 +1,6 @@
 # backend/terminal_style.py
 import os
+import re
 
 
 class PrintStyle:
@@ -101,6 +102,27 @@ class PrintStyle:
         )
 
 
+# Characters clean_text swaps out (smart quotes, dashes, emojis).
+_CLEAN_TEXT_REPLACEMENTS = {
+    "’": "'",
+    "‘": "'",
+    "“": '"',
+    "”": '"',
+    "–": "-",
+    "—": "-",
+    "…": "...",
+    "🙌": "",
+    "🚀": "",
+    "📂": "",
+    "🚨": "",
+    "👴": "",
+    "⚖️": "Licensing: ",
+    "⚠️": "Warning: ",
+}
+# Compiled once so clean_text is a single regex pass instead of one replace() per key
+_CLEAN_TEXT_RE = re.compile("|".join(map(re.escape, _CLEAN_TEXT_REPLACEMENTS)))
+
+
 class TextHelper:
     """
     Handles general text manipulation: cleaning, truncating, and formatting.
@@ -119,25 +141,7 @@ class TextHelper:
         if not isinstance(text, str):
             return str(text)
 
-        replacements = {
-            "’": "'",
-            "‘": "'",
-            "“": '"',
-            "”": '"',
-            "–": "-",
-            "—": "-",
-            "…": "...",
-            "🙌": "",
-            "🚀": "",
-            "📂": "",
-            "🚨": "",
-            "👴": "",
-            "⚖️": "Licensing: ",
-            "⚠️": "Warning: ",
-        }
-        for char, rep in replacements.items():
-            text = text.replace(char, rep)
-        return text
+        return _CLEAN_TEXT_RE.sub(lambda m: _CLEAN_TEXT_REPLACEMENTS[m.group(0)], text)
 
     @staticmethod
     def truncate_text(text, max_length=60):
@@ -147,3 +151,21 @@ class TextHelper:
         if not isinstance(text, str):
             return str(text)
         return f"{text[:max_length-3]}..." if len(text) > max_length else text
+
+    @staticmethod
+    def truncate_series(series, max_length=60):
+        """
+        Vectorized version of truncate_text for a whole pandas Series of text.
+        """
+        text = series.astype(str)
+        too_long = text.str.len() > max_length
+        return text.where(~too_long, text.str.slice(0, max_length - 3) + "...")
+
+    @staticmethod
+    def has_list_items(series):
+        """
+        Vectorized check for cells holding a non-empty stringified list.
+        A non-empty list is stored as "[...]" with at least one item, so a regex
+        is enough here and avoids running ast.literal_eval on every row.
+        """
+        return series.astype(str).str.match(r"\s*\[\s*[^\s\]]", na=False)